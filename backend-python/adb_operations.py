@@ -2,12 +2,105 @@
 ADB Operations Module
 Handles all Android Debug Bridge operations
 """
+import functools
 import subprocess
-import json
-from typing import List, Dict, Optional
+import queue
+import shlex
+import threading
+import time
+import uuid
+from collections import deque
+from typing import List, Dict, Iterator, Optional, Tuple
 import re
 
 
+# Seconds a successful startup device probe may be served before probing live
+_DEVICE_PREFETCH_MAX_AGE = 5
+
+# Matches lines of `getprop` output, e.g. "[ro.product.model]: [Pixel 7]"
+_PROP_RE = re.compile(r'^\[([^\]]+)\]: \[([^\]]*)\]$', re.M)
+
+# Matches raw lines of `pm list packages` output, e.g. b"package:com.android.phone"
+_PKG_RE = re.compile(rb'^package:(\S+)')
+
+# Common prefixes stripped when deriving a friendly app name (first match wins)
+_STRIP_PREFIX_RE = re.compile(r'com\.android\.|com\.google\.|com\.|org\.|net\.')
+
+# Dangerous - Critical system apps
+_DANGEROUS_PACKAGES = frozenset({
+    'com.android.systemui',
+    'com.android.phone',
+    'com.android.settings',
+    'com.android.launcher',
+    'com.android.launcher3',
+    'com.android.vending',  # Play Store
+})
+
+# Expert - May break functionality
+_EXPERT_PREFIXES = (
+    'com.google.android.gms',  # Google Play Services
+    'com.google.android.gsf',  # Google Services Framework
+    'com.android.bluetooth',
+    'com.android.nfc',
+)
+
+# Caution - OEM apps
+_CAUTION_PREFIXES = (
+    'com.samsung.',
+    'com.xiaomi.',
+    'com.miui.',
+    'com.huawei.',
+    'com.oppo.',
+    'com.vivo.',
+    'com.realme.',
+    'com.oneplus.',
+)
+
+
+def _get_app_name(package_name: str) -> str:
+    """Extract a friendly app name from package name"""
+    # Remove common prefixes
+    match = _STRIP_PREFIX_RE.match(package_name)
+    name = package_name[match.end():] if match else package_name
+
+    # Take the most relevant part and capitalize first letter
+    return name.partition('.')[0].capitalize()
+
+
+def _determine_safety_level(package_name: str) -> str:
+    """Determine safety level for removing a package"""
+    if package_name in _DANGEROUS_PACKAGES:
+        return "Dangerous"
+
+    if package_name.startswith(_EXPERT_PREFIXES):
+        return "Expert"
+
+    if package_name.startswith(_CAUTION_PREFIXES):
+        return "Caution"
+
+    # Default to Safe (user apps, bloatware)
+    return "Safe"
+
+
+# Name and safety level are pure functions of the package name, so repeat
+# listings (refresh after uninstall, filter changes) skip re-deriving them.
+# Only the immutable pair is cached; every listing gets fresh row dicts.
+@functools.lru_cache(maxsize=4096)
+def _package_labels(package_name: str) -> Tuple[str, str]:
+    """Return (appName, safetyLevel) for a package"""
+    return _get_app_name(package_name), _determine_safety_level(package_name)
+
+
+def _package_row(package_name: str) -> Dict[str, str]:
+    """Build the IPC row for a package"""
+    app_name, safety_level = _package_labels(package_name)
+    return {
+        "packageName": package_name,
+        "appName": app_name,
+        "safetyLevel": safety_level
+    }
+
+
 class ADBError(Exception):
     """Custom exception for ADB errors"""
     pass
@@ -34,12 +127,44 @@ class ADBOperations:
         bundled = os.path.join(base_dir, 'platform-tools', 'adb.exe')
         if os.path.exists(bundled):
             self.adb_path = bundled
-        elif shutil.which('adb'):
-            self.adb_path = shutil.which('adb')
+        elif (on_path := shutil.which('adb')):
+            self.adb_path = on_path
         elif os.path.exists(r'C:\platform-tools\adb.exe'):
             self.adb_path = r'C:\platform-tools\adb.exe'
         else:
             self.adb_path = 'adb'
+        
+        # Persistent `adb shell` session, started lazily by _ensure_shell()
+        self._shell = None
+        self._shell_lines = None
+        self._shell_lock = threading.Lock()
+        self._sentinel = f"__END_{uuid.uuid4().hex}__"
+        self._sentinel_bytes = self._sentinel.encode('ascii')
+        
+        # System properties don't change mid-session; cached per device serial
+        self._props = None
+        self._props_serial = None
+        
+        # Probe the device in the background so the first get_device_info()
+        # overlaps with UI startup instead of blocking it. A daemon thread, so
+        # a hung `adb devices` never delays interpreter exit.
+        self._prefetch = None  # (completed_at, info) if the startup probe succeeded
+        self._prefetch_done = threading.Event()
+        threading.Thread(target=self._prefetch_device, args=(self._prefetch_done,), daemon=True).start()
+    
+    def _raise_for_error(self, error_msg: str):
+        """Translate ADB error output into a friendly ADBError"""
+        error_msg = error_msg.strip() if error_msg else "Unknown error"
+        
+        # Parse common ADB errors
+        if "no devices" in error_msg.lower():
+            raise ADBError("No Android device connected. Please connect via USB.")
+        elif "device unauthorized" in error_msg.lower():
+            raise ADBError("Device unauthorized. Please check device for USB debugging prompt.")
+        elif "device offline" in error_msg.lower():
+            raise ADBError("Device is offline. Please reconnect the device.")
+        else:
+            raise ADBError(f"ADB command failed: {error_msg}")
     
     def _run_command(self, command: List[str], timeout: int = 30) -> str:
         """Run an ADB command and return output"""
@@ -54,17 +179,7 @@ class ADBOperations:
             )
             
             if result.returncode != 0:
-                error_msg = result.stderr.strip() if result.stderr else "Unknown error"
-                
-                # Parse common ADB errors
-                if "no devices found" in error_msg.lower():
-                    raise ADBError("No Android device connected. Please connect via USB.")
-                elif "device unauthorized" in error_msg.lower():
-                    raise ADBError("Device unauthorized. Please check device for USB debugging prompt.")
-                elif "device offline" in error_msg.lower():
-                    raise ADBError("Device is offline. Please reconnect the device.")
-                else:
-                    raise ADBError(f"ADB command failed: {error_msg}")
+                self._raise_for_error(result.stderr)
             
             return result.stdout
             
@@ -73,22 +188,158 @@ class ADBOperations:
         except FileNotFoundError:
             raise ADBError("ADB not found. Please install Android SDK Platform Tools.")
     
+    def _ensure_shell(self):
+        """Start the persistent `adb shell` process if it is not running"""
+        if self._shell is not None and self._shell.poll() is None:
+            return
+        
+        self._close_shell()
+        try:
+            self._shell = subprocess.Popen(
+                [self.adb_path, "shell"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                bufsize=0
+            )
+        except FileNotFoundError:
+            raise ADBError("ADB not found. Please install Android SDK Platform Tools.")
+        
+        # A reader thread lets _shell_exec wait on output with a timeout
+        lines = queue.Queue()
+        
+        def pump(stream, out):
+            for raw in iter(stream.readline, b''):
+                out.put(raw)
+            out.put(None)  # EOF – the shell exited
+        
+        threading.Thread(target=pump, args=(self._shell.stdout, lines), daemon=True).start()
+        self._shell_lines = lines
+    
+    def _close_shell(self):
+        """Terminate the persistent shell (it is restarted on next use)"""
+        if self._shell is not None:
+            try:
+                self._shell.kill()
+            except OSError:
+                pass
+        self._shell = None
+        self._shell_lines = None
+    
+    def _shell_stream(self, cmd: str, timeout: int = 30) -> Iterator[bytes]:
+        """
+        Run a command on the device through the persistent shell, yielding
+        raw output lines (without line endings) as they arrive
+        
+        The command is followed by an echo of a unique sentinel carrying the
+        exit code, so stdout is read until that line appears. The exit code
+        is the generator's return value. Lines are left undecoded so callers
+        that only need a few fields can skip decoding the rest.
+        """
+        request = f"{cmd} </dev/null 2>&1; echo {self._sentinel}$?\n".encode('utf-8')
+        
+        with self._shell_lock:
+            self._ensure_shell()
+            try:
+                self._shell.stdin.write(request)
+                self._shell.stdin.flush()
+            except OSError:
+                # The shell died since last use (e.g. device reconnected) – try once more
+                self._close_shell()
+                self._ensure_shell()
+                try:
+                    self._shell.stdin.write(request)
+                    self._shell.stdin.flush()
+                except OSError:
+                    pass  # reader thread reports EOF with adb's error output
+            
+            # Only the tail is kept, for the error message if adb exits early
+            recent = deque(maxlen=20)
+            finished = False
+            try:
+                while True:
+                    try:
+                        raw = self._shell_lines.get(timeout=timeout)
+                    except queue.Empty:
+                        self._close_shell()
+                        raise ADBError("ADB command timed out. Please check device connection.")
+                    
+                    if raw is None:
+                        # adb exited before the sentinel – usually no/unauthorized device
+                        self._close_shell()
+                        self._raise_for_error(b'\n'.join(recent).decode('utf-8', errors='replace'))
+                    
+                    line = raw.rstrip(b'\r\n')
+                    marker = line.find(self._sentinel_bytes)
+                    if marker != -1:
+                        finished = True
+                        if marker:
+                            yield line[:marker]
+                        return int(line[marker + len(self._sentinel_bytes):] or 1)
+                    recent.append(line)
+                    yield line
+            finally:
+                if not finished:
+                    # The consumer stopped before the sentinel; the rest of this
+                    # output would be read as the next command's, so start afresh
+                    self._close_shell()
+    
+    def _shell_exec(self, cmd: str, timeout: int = 30) -> Tuple[str, int]:
+        """
+        Run a command on the device through the persistent shell
+        
+        Returns:
+            (output, exit_code)
+        """
+        output = []
+        lines = self._shell_stream(cmd, timeout)
+        while True:
+            try:
+                output.append(next(lines))
+            except StopIteration as done:
+                return b'\n'.join(output).decode('utf-8', errors='replace'), done.value
+    
     def get_device_info(self) -> Dict:
         """Get information about connected Android device"""
+        # The first call may take the startup prefetch, but only a fresh
+        # success – a failure or stale result is re-probed live
+        done, self._prefetch_done = self._prefetch_done, None
+        if done is not None:
+            if not done.wait(timeout=30):
+                raise ADBError("ADB command timed out. Please check device connection.")
+            prefetch, self._prefetch = self._prefetch, None
+            if prefetch is not None and time.monotonic() - prefetch[0] <= _DEVICE_PREFETCH_MAX_AGE:
+                return prefetch[1]
+        return self._probe_device()
+    
+    def _prefetch_device(self, done: threading.Event):
+        """Run the startup device probe, keeping the result only on success"""
         try:
-            # Get device serial
-            devices = self._run_command([self.adb_path, "devices", "-l"])
-            lines = [l for l in devices.split('\n') if l.strip() and not l.startswith('List')]
-            
-            if not lines:
+            info = self._probe_device()
+            self._prefetch = (time.monotonic(), info)
+        except ADBError:
+            pass
+        finally:
+            done.set()
+    
+    def get_device_serial(self) -> Optional[str]:
+        """Return the serial of the first attached device, or None"""
+        devices = self._run_command([self.adb_path, "devices", "-l"])
+        lines = [l for l in devices.split('\n') if l.strip() and not l.startswith('List')]
+        return lines[0].split()[0] if lines else None
+    
+    def _probe_device(self) -> Dict:
+        """Query the connected device for its serial and properties"""
+        try:
+            serial = self.get_device_serial()
+            if serial is None:
                 raise ADBError("No device connected")
             
-            # Parse first device
-            device_line = lines[0]
-            parts = device_line.split()
-            serial = parts[0]
+            # Fetch all device properties in one roundtrip
+            if not self._props or self._props_serial != serial:
+                self._props = self._load_properties()
+                self._props_serial = serial
             
-            # Get device properties
             model = self._get_property("ro.product.model")
             product = self._get_property("ro.product.name")
             manufacturer = self._get_property("ro.product.manufacturer")
@@ -106,149 +357,65 @@ class ADBOperations:
         except Exception as e:
             raise ADBError(str(e))
     
+    def _load_properties(self) -> Dict[str, str]:
+        """Dump every device property with a single `getprop` call"""
+        output, exit_code = self._shell_exec("getprop")
+        if exit_code != 0:
+            return {}
+        return dict(_PROP_RE.findall(output))
+    
     def _get_property(self, prop: str) -> str:
         """Get a device property"""
-        try:
-            output = self._run_command([self.adb_path, "shell", "getprop", prop])
-            return output.strip()
-        except:
-            return "Unknown"
+        if self._props is None:
+            self._props = self._load_properties()
+        return self._props.get(prop, "Unknown")
     
     def list_packages(self, package_type: str = "all") -> List[Dict]:
         """List installed packages on device"""
         try:
             # Get package list
             if package_type == "system":
-                cmd = [self.adb_path, "shell", "pm", "list", "packages", "-s"]
+                cmd = "pm list packages -s"
             elif package_type == "user":
-                cmd = [self.adb_path, "shell", "pm", "list", "packages", "-3"]
+                cmd = "pm list packages -3"
             else:
-                cmd = [self.adb_path, "shell", "pm", "list", "packages"]
+                cmd = "pm list packages"
             
-            output = self._run_command(cmd)
-            
-            packages = []
-            for line in output.split('\n'):
-                if line.startswith('package:'):
-                    package_name = line.replace('package:', '').strip()
-                    if package_name:
-                        packages.append({
-                            "packageName": package_name,
-                            "appName": self._get_app_name(package_name),
-                            "safetyLevel": self._determine_safety_level(package_name)
-                        })
+            # Collect names as lines arrive instead of buffering the whole listing;
+            # anything else pm prints is kept for the error message
+            names = []
+            other = []
+            lines = self._shell_stream(cmd)
+            while True:
+                try:
+                    line = next(lines)
+                except StopIteration as done:
+                    exit_code = done.value
+                    break
+                match = _PKG_RE.match(line)
+                if match:
+                    names.append(match.group(1).decode('ascii', errors='replace'))
+                else:
+                    other.append(line)
             
-            # Sort by package name
-            packages.sort(key=lambda p: p["packageName"])
+            if exit_code != 0:
+                self._raise_for_error(b'\n'.join(other).decode('utf-8', errors='replace'))
             
-            return packages
+            # Sort the plain strings, then build rows already in order
+            names.sort()
+            return [_package_row(name) for name in names]
             
         except Exception as e:
             raise ADBError(f"Failed to list packages: {str(e)}")
     
-    def _guess_package_type(self, package: str) -> str:
-        """Guess if package is system or user app"""
-        system_prefixes = [
-            'com.android.',
-            'com.google.',
-            'com.samsung.',
-            'com.xiaomi.',
-            'com.huawei.',
-            'com.oppo.',
-            'com.vivo.',
-            'android.'
-        ]
-        
-        for prefix in system_prefixes:
-            if package.startswith(prefix):
-                return "system"
-        return "user"
-    
-    def _get_app_name(self, package_name: str) -> str:
-        """Extract a friendly app name from package name"""
-        # Remove common prefixes
-        name = package_name
-        prefixes = ['com.android.', 'com.google.', 'com.', 'org.', 'net.']
-        for prefix in prefixes:
-            if name.startswith(prefix):
-                name = name[len(prefix):]
-                break
-        
-        # Split by dots and take the most relevant part
-        parts = name.split('.')
-        if parts:
-            name = parts[0]
-        
-        # Capitalize first letter
-        return name.capitalize()
-    
-    def _determine_safety_level(self, package_name: str) -> str:
-        """Determine safety level for removing a package"""
-        # Dangerous - Critical system apps
-        dangerous_packages = {
-            'com.android.systemui',
-            'com.android.phone',
-            'com.android.settings',
-            'com.android.launcher',
-            'com.android.launcher3',
-            'com.android.vending',  # Play Store
-        }
-        
-        # Expert - May break functionality
-        expert_prefixes = [
-            'com.google.android.gms',  # Google Play Services
-            'com.google.android.gsf',  # Google Services Framework
-            'com.android.bluetooth',
-            'com.android.nfc',
-        ]
-        
-        # Caution - OEM apps
-        caution_prefixes = [
-            'com.samsung.',
-            'com.xiaomi.',
-            'com.miui.',
-            'com.huawei.',
-            'com.oppo.',
-            'com.vivo.',
-            'com.realme.',
-            'com.oneplus.',
-        ]
-        
-        # Check dangerous
-        if package_name in dangerous_packages:
-            return "Dangerous"
-        
-        # Check expert
-        for prefix in expert_prefixes:
-            if package_name.startswith(prefix):
-                return "Expert"
-        
-        # Check caution
-        for prefix in caution_prefixes:
-            if package_name.startswith(prefix):
-                return "Caution"
-        
-        # Default to Safe (user apps, bloatware)
-        return "Safe"
-    
     def uninstall_package(self, package_name: str) -> Dict:
         """Uninstall a package from device"""
         try:
             # Try uninstall
-            output = self._run_command(
-                [self.adb_path, "shell", "pm", "uninstall", "--user", "0", package_name]
+            output, _ = self._shell_exec(
+                f"pm uninstall --user 0 {shlex.quote(package_name)}"
             )
-            
-            if "Success" in output:
-                return {
-                    "success": True,
-                    "message": f"Successfully uninstalled {package_name}"
-                }
-            else:
-                return {
-                    "success": False,
-                    "message": f"Failed to uninstall: {output.strip()}"
-                }
+            return self._uninstall_result(package_name, output)
                 
         except Exception as e:
             return {
@@ -256,12 +423,77 @@ class ADBOperations:
                 "message": str(e)
             }
     
+    def uninstall_packages(self, package_names: List[str]) -> List[Dict]:
+        """
+        Uninstall several packages in one shell roundtrip
+        
+        Each `pm uninstall` is preceded by an echoed delimiter so the combined
+        output can be split back per package. Results are in input order.
+        If the shell fails mid-batch, packages that already finished keep
+        their real result; the rest get success None (outcome unknown).
+        """
+        if not package_names:
+            return []
+        
+        delimiter = f"__PKG_{uuid.uuid4().hex}__"
+        delimiter_bytes = delimiter.encode('ascii')
+        # Grouped so _shell_stream's stdin/stderr redirects cover every command
+        script = "{ " + "; ".join(
+            f"echo {delimiter}; pm uninstall --user 0 {shlex.quote(name)}"
+            for name in package_names
+        ) + "; }"
+        
+        # Split output per package as it arrives: a delimiter line closes the
+        # previous package's output and opens the next one's
+        results = []
+        current = None
+        
+        def finish(lines):
+            output = b'\n'.join(lines).decode('utf-8', errors='replace')
+            results.append(self._uninstall_result(package_names[len(results)], output))
+        
+        try:
+            for line in self._shell_stream(script):
+                if line == delimiter_bytes:
+                    if current is not None:
+                        finish(current)
+                    current = []
+                elif current is not None:
+                    current.append(line)
+        except Exception as e:
+            # pm prints Success only once the package is gone
+            if current is not None and any(b"Success" in line for line in current):
+                finish(current)
+            return results + [
+                {"success": None, "message": f"Uninstall result unknown: {e}"}
+                for _ in package_names[len(results):]
+            ]
+        
+        if current is not None:
+            finish(current)
+        while len(results) < len(package_names):
+            finish([])
+        return results
+    
+    def _uninstall_result(self, package_name: str, output: str) -> Dict:
+        """Turn `pm uninstall` output into a result dict"""
+        if "Success" in output:
+            return {
+                "success": True,
+                "message": f"Successfully uninstalled {package_name}"
+            }
+        else:
+            return {
+                "success": False,
+                "message": f"Failed to uninstall: {output.strip()}"
+            }
+    
     def reinstall_package(self, package_name: str) -> Dict:
         """Reinstall a previously removed package"""
         try:
             # Reinstall for user 0
-            output = self._run_command(
-                [self.adb_path, "shell", "cmd", "package", "install-existing", package_name]
+            output, _ = self._shell_exec(
+                f"cmd package install-existing {shlex.quote(package_name)}"
             )
             
             if "installed" in output.lower():
@@ -3,11 +3,22 @@ AI Advisor Module
 Handles AI-powered package analysis using Perplexity or OpenAI
 """
 import os
+import re
 import sys
 import json
-import requests
-from typing import Dict
-from dotenv import load_dotenv
+import time
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+# orjson decodes straight from response bytes and is several times faster
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 
 
 def _get_base_dir():
@@ -17,10 +28,25 @@ def _get_base_dir():
     return os.path.dirname(os.path.abspath(__file__))
 
 
-# Load environment variables – search next to the exe/script, then CWD
 _base = _get_base_dir()
-load_dotenv(os.path.join(_base, '.env'))
-load_dotenv()  # also try CWD as fallback
+_dotenv_loaded = False
+
+
+def _load_env():
+    """Load .env once – search next to the exe/script, then CWD"""
+    global _dotenv_loaded
+    if _dotenv_loaded:
+        return
+    from dotenv import load_dotenv
+    load_dotenv(os.path.join(_base, '.env'))
+    load_dotenv()  # also try CWD as fallback
+    _dotenv_loaded = True
+
+# Package analyses barely change, so keep them on disk across sessions
+_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60
+
+# Captures the JSON body inside an optional ```json ... ``` fence
+_FENCE_RE = re.compile(r'^\s*```(?:json)?\s*(.*?)\s*```\s*$', re.S)
 
 
 class AIAdvisor:
@@ -34,6 +60,7 @@ class AIAdvisor:
             provider: "perplexity" or "openai"
         """
         self.provider = provider
+        _load_env()
         
         if provider == "perplexity":
             self.api_key = os.getenv("PERPLEXITY_API_KEY")
@@ -47,12 +74,115 @@ class AIAdvisor:
         if not self.api_key:
             print(f"[Warning] {provider.upper()}_API_KEY not found – AI features will be unavailable", file=sys.stderr)
             self.api_key = None  # AI methods will return error gracefully
+        
+        # Fixed request fields, built once and merged with messages per call
+        self._analyze_payload = {"model": self.model, "temperature": 0.2, "max_tokens": 1500}
+        self._chat_payload = {"model": self.model, "temperature": 0.7, "max_tokens": 800}
+        if provider == "perplexity":
+            self._analyze_payload.update({
+                "return_citations": False,
+                "return_images": False,
+                "search_recency_filter": "month"
+            })
+            self._chat_payload.update({
+                "return_citations": False,
+                "return_images": False
+            })
+        
+        # Keep-alive HTTP session, created on first request (see _get_session)
+        self._session = None
+        self._session_lock = threading.Lock()
+        
+        self._cache = self._open_cache()
+        self._cache_lock = threading.Lock()
+    
+    def _get_session(self):
+        """
+        Return the shared keep-alive session, importing requests on first use
+        
+        requests pulls in urllib3 and ssl, so it is only loaded once AI is
+        actually used rather than at backend startup. Rate limits (429) and
+        5xx responses are retried with exponential backoff.
+        """
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+                session = requests.Session()
+                session.headers.update({
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json"
+                })
+                # Back off and retry rate limits and transient server errors.
+                # A read timeout may mean the (billed) request is still running,
+                # so only connection failures and status codes are retried.
+                retry = Retry(
+                    total=3,
+                    read=0,
+                    other=0,
+                    backoff_factor=0.5,
+                    status_forcelist=[429, 500, 502, 503, 504],
+                    allowed_methods=frozenset({"POST"}),
+                    raise_on_status=False
+                )
+                session.mount("https://", HTTPAdapter(max_retries=retry))
+                self._session = session
+        return self._session
+    
+    def _open_cache(self):
+        """Open the on-disk analysis cache, or return None if it is unavailable"""
+        try:
+            cache_dir = Path.home() / "DebloatAI"
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(cache_dir / "ai_cache.db"), check_same_thread=False)
+            conn.execute("CREATE TABLE IF NOT EXISTS cache(key TEXT PRIMARY KEY, value TEXT, ts INTEGER)")
+            conn.commit()
+            return conn
+        except (OSError, sqlite3.Error) as e:
+            print(f"[Warning] AI cache unavailable: {e}", file=sys.stderr)
+            return None
+    
+    def _cache_get(self, key: str):
+        """Return a cached analysis younger than the TTL, or None"""
+        if self._cache is None:
+            return None
+        try:
+            with self._cache_lock:
+                row = self._cache.execute(
+                    "SELECT value FROM cache WHERE key=? AND ts > ?",
+                    (key, int(time.time()) - _CACHE_TTL_SECONDS)
+                ).fetchone()
+            return _loads(row[0]) if row else None
+        except (sqlite3.Error, ValueError):
+            return None
+    
+    def _cache_put(self, key: str, analysis: Dict):
+        """Store an analysis; cache failures never break the request"""
+        if self._cache is None:
+            return
+        try:
+            with self._cache_lock:
+                self._cache.execute(
+                    "INSERT OR REPLACE INTO cache(key, value, ts) VALUES (?, ?, ?)",
+                    (key, json.dumps(analysis, ensure_ascii=False), int(time.time()))
+                )
+                self._cache.commit()
+        except sqlite3.Error:
+            pass
     
     def analyze_package(self, package_name: str) -> Dict:
         """Analyze an Android package and return safety information"""
         if not self.api_key:
             return {"error": "API key not configured. Add PERPLEXITY_API_KEY to .env file.", "safetyLevel": "unknown", "appName": package_name, "description": "AI analysis unavailable", "recommendation": "Configure API key to enable AI analysis"}
         
+        cache_key = f"{self.provider}:{self.model}:{package_name}"
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        import requests  # deferred, see _get_session
+        
         prompt = f"""You are an Android package analysis expert. Analyze package: {package_name}
 
 Return ONLY valid JSON (no markdown, no explanation):
@@ -77,11 +207,6 @@ Risk categories:
 - Dangerous: Critical system components"""
 
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
             messages = []
             
             # Perplexity doesn't support system role, combine into user message
@@ -105,51 +230,28 @@ Risk categories:
                     }
                 ]
             
-            payload = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": 0.2,
-                "max_tokens": 1500
-            }
-            
-            # Add provider-specific parameters
-            if self.provider == "perplexity":
-                payload.update({
-                    "return_citations": False,
-                    "return_images": False,
-                    "search_recency_filter": "month"
-                })
+            payload = {**self._analyze_payload, "messages": messages}
             
-            response = requests.post(
+            response = self._get_session().post(
                 self.api_url,
-                headers=headers,
                 json=payload,
                 timeout=30
             )
             
-            # Debug: Print error details if request fails
             if response.status_code != 200:
-                print(f"Error Response Status: {response.status_code}")
-                print(f"Error Response Body: {response.text}")
-            
-            response.raise_for_status()
-            data = response.json()
+                raise Exception(f"AI API {response.status_code}: {response.text[:500]}")
+            data = _loads(response.content)
             
             # Extract content
             content = data["choices"][0]["message"]["content"]
             
             # Clean markdown if present
-            content = content.strip()
-            if content.startswith("```json"):
-                content = content[7:]
-            if content.startswith("```"):
-                content = content[3:]
-            if content.endswith("```"):
-                content = content[:-3]
-            content = content.strip()
+            match = _FENCE_RE.match(content)
+            content = match.group(1) if match else content.strip()
             
             # Parse JSON
-            analysis = json.loads(content)
+            analysis = _loads(content)
+            self._cache_put(cache_key, analysis)
             return analysis
             
         except requests.exceptions.RequestException as e:
@@ -159,6 +261,26 @@ Risk categories:
         except Exception as e:
             raise Exception(f"Analysis failed: {str(e)}")
     
+    def analyze_packages(self, package_names: List[str], max_workers: int = 8) -> List[Dict]:
+        """
+        Analyze several packages concurrently
+        
+        Returns one result per package, in input order. A package whose
+        analysis fails gets {"packageName": ..., "error": ...} instead of
+        aborting the whole batch.
+        """
+        def analyze_one(package_name: str) -> Dict:
+            try:
+                return self.analyze_package(package_name)
+            except Exception as e:
+                return {"packageName": package_name, "error": str(e)}
+        
+        if not package_names:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(package_names))) as executor:
+            return list(executor.map(analyze_one, package_names))
+    
     def chat(self, message: str, history: list = None) -> str:
         """Chat with AI about debloating"""
         if not self.api_key:
@@ -168,11 +290,6 @@ Risk categories:
             history = []
         
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
             messages = []
             
             # Perplexity doesn't support system role
@@ -201,28 +318,16 @@ Be concise and friendly."""
                     "content": message
                 })
             
-            payload = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": 0.7,
-                "max_tokens": 800
-            }
-            
-            if self.provider == "perplexity":
-                payload.update({
-                    "return_citations": False,
-                    "return_images": False
-                })
+            payload = {**self._chat_payload, "messages": messages}
             
-            response = requests.post(
+            response = self._get_session().post(
                 self.api_url,
-                headers=headers,
                 json=payload,
                 timeout=30
             )
             
             response.raise_for_status()
-            data = response.json()
+            data = _loads(response.content)
             
             return data["choices"][0]["message"]["content"]
             
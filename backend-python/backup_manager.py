@@ -2,12 +2,56 @@
 Backup Manager Module
 Handles backup and restore of uninstalled packages
 """
+import copy
 import json
 import os
 from datetime import datetime
+from operator import itemgetter
 from typing import List, Dict
 from pathlib import Path
 
+# orjson parses/serialises straight from bytes; stdlib json is the fallback
+try:
+    import orjson
+    _loads = orjson.loads
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _load_json(path) -> Dict:
+    """Read and parse a JSON file in one binary read"""
+    with open(path, 'rb') as f:
+        return _loads(f.read())
+
+
+def _dump_json(path, obj):
+    """
+    Serialise obj and write it atomically
+    
+    The payload goes to a temp file that is fsynced and then renamed over
+    the target, so a crash never leaves a half-written backup behind.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(_dumps(obj))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+
 
 class BackupManager:
     """Manage backups of uninstalled packages"""
@@ -23,23 +67,26 @@ class BackupManager:
         
         # Create backup directory if it doesn't exist
         self.backup_dir.mkdir(parents=True, exist_ok=True)
+        
+        # path -> (mtime_ns, size, listing entry); unchanged files aren't re-parsed
+        self._meta_cache = {}
     
     def create_backup(self, packages: List[str], device_info: Dict = None) -> Dict:
         """Create a backup of packages"""
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            now = datetime.now()
+            timestamp = now.strftime("%Y%m%d_%H%M%S")
             backup_name = f"backup_{timestamp}.json"
             backup_path = self.backup_dir / backup_name
             
             backup_data = {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now.isoformat(),
                 "deviceInfo": device_info or {},
                 "packages": packages,
                 "count": len(packages)
             }
             
-            with open(backup_path, 'w', encoding='utf-8') as f:
-                json.dump(backup_data, f, indent=2, ensure_ascii=False)
+            _dump_json(backup_path, backup_data)
             
             return {
                 "success": True,
@@ -58,27 +105,51 @@ class BackupManager:
         """List all available backups"""
         try:
             backups = []
-            
-            for backup_file in self.backup_dir.glob("backup_*.json"):
-                try:
-                    with open(backup_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
+            meta_cache = {}
+            
+            with os.scandir(self.backup_dir) as it:
+                for entry in it:
+                    if not (entry.name.startswith("backup_") and entry.name.endswith(".json")):
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
                     
-                    backups.append({
-                        "name": backup_file.name,
-                        "path": str(backup_file),
-                        "timestamp": data.get("timestamp", ""),
-                        "packageCount": data.get("count", 0),
-                        "deviceInfo": data.get("deviceInfo", {})
-                    })
-                except:
-                    # Skip corrupted backup files
-                    continue
-            
-            # Sort by timestamp (newest first)
-            backups.sort(key=lambda x: x["timestamp"], reverse=True)
-            
-            return backups
+                    cached = self._meta_cache.get(entry.path)
+                    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                        meta = cached[2]
+                    else:
+                        # Too small to hold a backup object – skip without opening
+                        if st.st_size < 2:
+                            continue
+                        try:
+                            data = _load_json(entry.path)
+                        except (OSError, ValueError):
+                            # Skip unreadable or corrupted backup files
+                            continue
+                        if not isinstance(data, dict):
+                            continue
+                        
+                        meta = {
+                            "name": entry.name,
+                            "path": entry.path,
+                            "timestamp": data.get("timestamp", ""),
+                            "packageCount": data.get("count", 0),
+                            "deviceInfo": data.get("deviceInfo", {})
+                        }
+                    meta_cache[entry.path] = (st.st_mtime_ns, st.st_size, meta)
+                    backups.append((st.st_mtime_ns, meta))
+            
+            # Only keep entries for files that still exist
+            self._meta_cache = meta_cache
+            
+            # Sort by modification time (newest first) – an int compare, not a string one
+            backups.sort(key=itemgetter(0), reverse=True)
+            
+            # Cached metadata is reused across calls, so hand out copies
+            # (deviceInfo is nested) that callers may mutate freely
+            return [copy.deepcopy(meta) for _, meta in backups]
             
         except Exception as e:
             raise Exception(f"Failed to list backups: {str(e)}")
@@ -94,8 +165,7 @@ class BackupManager:
                     "message": f"Backup not found: {backup_name}"
                 }
             
-            with open(backup_path, 'r', encoding='utf-8') as f:
-                backup_data = json.load(f)
+            backup_data = _load_json(backup_path)
             
             packages = backup_data.get("packages", [])
             
@@ -2,7 +2,11 @@
 Persistent Backend Process
 Reads JSON commands from stdin, writes JSON responses to stdout.
 Stays alive for the lifetime of the Electron app (no per-call spawn overhead).
+
+Every message in either direction is framed as a 4-byte big-endian length
+followed by that many bytes of UTF-8 JSON.
 """
+import os
 import sys
 import json
 import traceback
@@ -11,74 +15,118 @@ from ai_advisor import AIAdvisor
 from backup_manager import BackupManager
 from openclaw_integration import OpenClawIntegration
 
-
-def handle_command(command_data, adb, backup_mgr, advisor, openclaw):
-    """Route a single command and return the result."""
-    command = command_data.get("command")
-    args = command_data.get("args", {})
-
-    if command == "get_device_info":
-        try:
-            return adb.get_device_info()
-        except ADBError:
-            return None
-
-    elif command == "list_packages":
+# orjson parses/serialises the IPC traffic several times faster; stdlib json
+# is the fallback. Both work on UTF-8 bytes so stdin/stdout skip text decoding.
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj):
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+class FrameReader:
+    """Read length-prefixed messages from a file descriptor."""
+
+    def __init__(self, fd):
+        self._fd = fd
+        self._buf = bytearray()
+
+    def _fill(self):
+        chunk = os.read(self._fd, 65536)
+        if not chunk:
+            return False
+        self._buf += chunk
+        return True
+
+    def read_frame(self):
+        """Read one message; return None at EOF."""
+        while len(self._buf) < 4:
+            if not self._fill():
+                return None
+        end = 4 + int.from_bytes(self._buf[:4], "big")
+        while len(self._buf) < end:
+            if not self._fill():
+                return None
+        body = bytes(self._buf[4:end])
+        del self._buf[:end]
+        return body
+
+
+def write_frame(stream, obj):
+    """Serialise `obj` and write it as one length-prefixed message."""
+    payload = _dumps(obj)
+    stream.write(len(payload).to_bytes(4, "big") + payload)
+    stream.flush()
+
+
+def _or_default(fn, default):
+    """Wrap an ADB call so a missing/unauthorized device yields `default`."""
+    def call(args):
         try:
-            return adb.list_packages(args.get("type", "all"))
+            return fn(args)
         except ADBError:
-            return []
-
-    elif command == "uninstall_package":
-        return adb.uninstall_package(args.get("packageName"))
+            return default
+    return call
 
-    elif command == "reinstall_package":
-        return adb.reinstall_package(args.get("packageName"))
 
-    elif command == "analyze_package":
-        return advisor.analyze_package(args.get("packageName"))
-
-    elif command == "chat_message":
-        response = advisor.chat(args.get("message", ""), args.get("history", []))
-        return {"response": response}
-    
-    # OpenClaw Integration Commands
-    elif command == "parse_chat_command":
-        # Parse message for actions
-        message = args.get("message", "")
-        return openclaw.process_message(message)
-    
-    elif command == "execute_action":
-        # Execute confirmed action
-        execution_result = args.get("executionResult", {})
-        confirmed = args.get("confirmed", False)
-        return openclaw.execute_confirmed_action(execution_result, confirmed)
-
-    elif command == "create_backup":
-        return backup_mgr.create_backup(args.get("packages", []), args.get("deviceInfo"))
-
-    elif command == "list_backups":
-        return backup_mgr.list_backups()
-
-    elif command == "restore_backup":
-        return backup_mgr.restore_backup(args.get("backupName"))
-
-    elif command == "delete_backup":
-        return backup_mgr.delete_backup(args.get("backupName"))
-
-    elif command == "get_backup_path":
-        return {"path": backup_mgr.get_backup_path()}
-
-    else:
+def build_dispatch(adb, backup_mgr, advisor, openclaw):
+    """Map each command name to a handler taking the request args."""
+    def changes_packages(fn):
+        # Keep OpenClaw's cached package list in step with UI-driven changes
+        def call(args):
+            try:
+                return fn(args)
+            finally:
+                openclaw.executor.invalidate()
+        return call
+
+    return {
+        "get_device_info": _or_default(lambda a: adb.get_device_info(), None),
+        "list_packages": _or_default(lambda a: adb.list_packages(a.get("type", "all")), []),
+        "uninstall_package": changes_packages(lambda a: adb.uninstall_package(a.get("packageName"))),
+        "reinstall_package": changes_packages(lambda a: adb.reinstall_package(a.get("packageName"))),
+        "analyze_package": lambda a: advisor.analyze_package(a.get("packageName")),
+        "analyze_packages": lambda a: advisor.analyze_packages(a.get("packageNames", [])),
+        "chat_message": lambda a: {"response": advisor.chat(a.get("message", ""), a.get("history", []))},
+
+        # OpenClaw Integration Commands
+        "parse_chat_command": lambda a: openclaw.process_message(a.get("message", "")),
+        "execute_action": lambda a: openclaw.execute_confirmed_action(
+            a.get("executionResult", {}), a.get("confirmed", False)
+        ),
+
+        "create_backup": lambda a: backup_mgr.create_backup(a.get("packages", []), a.get("deviceInfo")),
+        "list_backups": lambda a: backup_mgr.list_backups(),
+        "restore_backup": lambda a: backup_mgr.restore_backup(a.get("backupName")),
+        "delete_backup": lambda a: backup_mgr.delete_backup(a.get("backupName")),
+        "get_backup_path": lambda a: {"path": backup_mgr.get_backup_path()},
+    }
+
+
+def handle_command(command_data, dispatch):
+    """Route a single command and return the result."""
+    command = command_data.get("command")
+    handler = dispatch.get(command)
+    if handler is None:
         return {"success": False, "error": f"Unknown command: {command}"}
+    return handler(command_data.get("args", {}))
 
 
 def main():
     """
-    Persistent process: initialise modules once, then loop over stdin lines.
-    Each line is a JSON object with {id, command, args}.
+    Persistent process: initialise modules once, then loop over stdin frames.
+    Each frame is a JSON object with {id, command, args}.
     Each response is a JSON object with {id, result} or {id, error}.
     """
+    # Frames are the only thing allowed on fd 1: a stray print (ours or a
+    # library's) would be read as a length header and stall every response
+    stdout = sys.stdout.buffer
+    sys.stdout = sys.stderr
+
     # Initialise heavy modules once
     adb = ADBOperations()
     backup_mgr = BackupManager()
@@ -94,35 +142,36 @@ def main():
     
     # Initialize OpenClaw integration
     openclaw = OpenClawIntegration(adb)
+    dispatch = build_dispatch(adb, backup_mgr, advisor, openclaw)
+
+    reader = FrameReader(sys.stdin.fileno())
 
     # Signal that we are ready
-    sys.stdout.write(json.dumps({"status": "ready"}) + "\n")
-    sys.stdout.flush()
+    write_frame(stdout, {"status": "ready"})
 
     while True:
         try:
-            line = sys.stdin.readline()
-            if not line:
+            frame = reader.read_frame()
+            if frame is None:
                 break  # EOF – Electron closed our stdin
-            line = line.strip()
-            if not line:
+            if not frame:
                 continue
 
-            request = json.loads(line)
+            request = _loads(frame)
             request_id = request.get("id")
 
             try:
-                result = handle_command(request, adb, backup_mgr, advisor, openclaw)
+                result = handle_command(request, dispatch)
                 response = {"id": request_id, "result": result}
             except Exception as exc:
                 response = {"id": request_id, "error": str(exc)}
 
-            sys.stdout.write(json.dumps(response, ensure_ascii=False) + "\n")
-            sys.stdout.flush()
+            # Flush every response: the next queued request may be a slow
+            # AI or adb call, and Electron has other requests awaiting this one
+            write_frame(stdout, response)
 
         except json.JSONDecodeError as exc:
-            sys.stdout.write(json.dumps({"id": None, "error": f"JSON parse error: {exc}"}) + "\n")
-            sys.stdout.flush()
+            write_frame(stdout, {"id": None, "error": f"JSON parse error: {exc}"})
         except Exception:
             traceback.print_exc(file=sys.stderr)
 
@@ -2,35 +2,136 @@
 OpenClaw Integration Module
 Enables chatbot to execute actions via command parsing
 """
+import functools
 import json
 import re
+import threading
+import time
 from typing import Dict, List, Optional, Tuple
 from adb_operations import ADBOperations
 
+# Optional: Hyperscan finds which intent pattern fires in a single DFA pass
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Package-name shapes in free text: com.anything, or at least three dotted parts
+_PACKAGE_NAME_RE = re.compile(r'com\.[a-zA-Z0-9_.]+|[a-z]+\.[a-zA-Z0-9_.]+\.[a-zA-Z0-9_]+')
+
+# Substrings that mark a package as likely bloatware
+_BLOATWARE_INDICATORS = (
+    'facebook', 'fb', 'instagram', 'tiktok',
+    'netflix', 'spotify', 'amazon',
+    'samsung.', 'xiaomi.', 'miui.', 'huawei.',
+    'weather', 'news', 'browser',
+    'game', 'music', 'video'
+)
+
+# All indicators in one alternation, so each name is scanned once in C
+_BLOATWARE_RE = re.compile('|'.join(map(re.escape, _BLOATWARE_INDICATORS)))
+
+# Critical system apps that are never flagged
+_CRITICAL_PACKAGES = frozenset({
+    'com.android.systemui',
+    'com.android.phone',
+    'com.android.settings',
+    'com.google.android.gms'
+})
+
+
+# Pure function of the package name, so repeat scans are served from the cache
+@functools.lru_cache(maxsize=8192)
+def _is_likely_bloatware(package_name: str) -> bool:
+    """Check if package is likely bloatware"""
+    if package_name in _CRITICAL_PACKAGES:
+        return False
+    
+    return _BLOATWARE_RE.search(package_name.lower()) is not None
+
+
+# Intent patterns in priority order (first match wins); a pattern's index is
+# its Hyperscan id, and each keeps its own groups for _extract_entities
+_INTENT_PATTERNS: Tuple[Tuple[str, re.Pattern], ...] = tuple(
+    (intent, re.compile(pattern))
+    for intent, pattern in (
+        ('uninstall', r'\b(remove|uninstall|delete|get rid of)\s+(.+)'),
+        ('uninstall', r'\b(disable|turn off)\s+(.+)'),
+        ('scan', r'\b(scan|check|find|show|list)\s+(bloatware|packages|apps)'),
+        ('scan', r'what (bloatware|packages|apps)'),
+        ('backup', r'\b(create|make|backup)\s+(backup|save)'),
+        ('restore', r'\b(restore|reinstall)\s+(.+)'),
+        ('analyze', r'\b(analyze|check|tell me about|info about|what is)\s+(.+)'),
+    )
+)
+
+
+def _build_hyperscan_db():
+    """Compile all intent patterns into one Hyperscan database, if available"""
+    if hyperscan is None:
+        return None
+    try:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[pattern.pattern.encode('utf-8') for _, pattern in _INTENT_PATTERNS],
+            ids=list(range(len(_INTENT_PATTERNS))),
+            flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(_INTENT_PATTERNS)
+        )
+        return db
+    except hyperscan.error:
+        return None
+
+
+_HS_DB = _build_hyperscan_db()
+
+# A Hyperscan scratch space serves one scan at a time, so each thread gets its own
+_hs_local = threading.local()
+
+
+def _hs_scratch():
+    """Return this thread's scratch space for _HS_DB"""
+    scratch = getattr(_hs_local, 'scratch', None)
+    if scratch is None:
+        scratch = _hs_local.scratch = hyperscan.Scratch(_HS_DB)
+    return scratch
+
 
 class CommandParser:
     """Parse natural language commands into actions"""
     
+    __slots__ = ('_classify',)
+    
+    # Distinct lowercased messages whose parse is remembered per parser
+    PARSE_CACHE_SIZE = 1024
+    
     def __init__(self):
-        self.intent_patterns = {
-            'uninstall': [
-                r'\b(remove|uninstall|delete|get rid of)\s+(.+)',
-                r'\b(disable|turn off)\s+(.+)',
-            ],
-            'scan': [
-                r'\b(scan|check|find|show|list)\s+(bloatware|packages|apps)',
-                r'what (bloatware|packages|apps)',
-            ],
-            'backup': [
-                r'\b(create|make|backup)\s+(backup|save)',
-            ],
-            'restore': [
-                r'\b(restore|reinstall)\s+(.+)',
-            ],
-            'analyze': [
-                r'\b(analyze|check|tell me about|info about|what is)\s+(.+)',
-            ],
-        }
+        # Chat clients repeat the same phrases ("scan for bloatware", "confirm"),
+        # so classification is memoized on the normalized message
+        self._classify = functools.lru_cache(maxsize=self.PARSE_CACHE_SIZE)(self._classify_uncached)
+    
+    def _match_intent(self, message_lower: str) -> Optional[Tuple[str, re.Match]]:
+        """Return (intent, match) for the highest-priority pattern that matches"""
+        # Hyperscan's \b and \s are ASCII-only, so non-ASCII text goes to re
+        if _HS_DB is not None and message_lower.isascii():
+            hits = []
+            _HS_DB.scan(
+                message_lower.encode('ascii'),
+                match_event_handler=lambda pattern_id, start, end, flags, context: hits.append(pattern_id),
+                scratch=_hs_scratch()
+            )
+            if not hits:
+                return None
+            # Hyperscan only says which pattern fired; re extracts its groups
+            intent, pattern = _INTENT_PATTERNS[min(hits)]
+            match = pattern.search(message_lower)
+            if match:
+                return intent, match
+        
+        for intent, pattern in _INTENT_PATTERNS:
+            match = pattern.search(message_lower)
+            if match:
+                return intent, match
+        return None
     
     def parse_command(self, message: str) -> Dict:
         """
@@ -44,31 +145,40 @@ class CommandParser:
                 'actionable': True/False
             }
         """
-        message_lower = message.lower().strip()
+        intent, entities = self._classify(message.lower().strip())
         
-        # Check each intent pattern
-        for intent, patterns in self.intent_patterns.items():
-            for pattern in patterns:
-                match = re.search(pattern, message_lower)
-                if match:
-                    entities = self._extract_entities(intent, match, message_lower)
-                    return {
-                        'intent': intent,
-                        'entities': entities,
-                        'confidence': 0.8,
-                        'actionable': True,
-                        'original_message': message
-                    }
+        # The cached entities are shared, so hand out copies callers may mutate
+        entities = dict(entities)
+        if 'packages' in entities:
+            entities['packages'] = list(entities['packages'])
         
-        # No action detected - regular chat
+        # 'chat' means no action was detected
+        actionable = intent != 'chat'
         return {
-            'intent': 'chat',
-            'entities': {},
-            'confidence': 1.0,
-            'actionable': False,
+            'intent': intent,
+            'entities': entities,
+            'confidence': 0.8 if actionable else 1.0,
+            'actionable': actionable,
             'original_message': message
         }
     
+    def _classify_uncached(self, message_lower: str) -> Tuple[str, Dict]:
+        """Return (intent, entities) for a lowercased message; 'chat' if none"""
+        found = self._match_intent(message_lower)
+        if found:
+            intent, match = found
+            return intent, self._extract_entities(intent, match, message_lower)
+        return 'chat', {}
+    
+    def parse_commands(self, messages: List[str]) -> List[Dict]:
+        """
+        Parse a batch of messages in one call
+        
+        Returns one parse_command() result per message, in input order.
+        """
+        parse = self.parse_command
+        return [parse(message) for message in messages]
+    
     def _extract_entities(self, intent: str, match: re.Match, message: str) -> Dict:
         """Extract relevant entities based on intent"""
         entities = {}
@@ -93,22 +203,49 @@ class CommandParser:
     
     def _extract_package_names(self, text: str) -> List[str]:
         """Extract potential package names from text"""
-        # Check for actual package format (com.example.package)
-        package_pattern = r'com\.[a-zA-Z0-9_.]+|[a-z]+\.[a-zA-Z0-9_.]+\.[a-zA-Z0-9_]+'
-        packages = re.findall(package_pattern, text)
-        
-        if packages:
-            return packages
-        
-        # If no package format found, return keywords for fuzzy matching
-        return [text]
+        # Check for actual package format (com.example.package); if none is
+        # found, return the text as a keyword for fuzzy matching
+        return _PACKAGE_NAME_RE.findall(text) or [text]
 
 
 class ActionExecutor:
     """Execute actions parsed from commands"""
     
+    __slots__ = ('adb', '_pkg_cache', '_pkg_cache_ts', '_pkg_cache_serial')
+    
+    # Seconds a fetched package list is reused across chat commands
+    PACKAGE_CACHE_TTL = 10
+    
     def __init__(self, adb_operations: ADBOperations):
         self.adb = adb_operations
+        self._pkg_cache = None
+        self._pkg_cache_ts = 0.0
+        self._pkg_cache_serial = None
+    
+    def _packages(self) -> Tuple[List[Dict], List[str], List[str]]:
+        """
+        Return all device packages, refetching at most every PACKAGE_CACHE_TTL seconds
+        or as soon as a different device is attached
+        
+        Returns:
+            (rows, names, lowercased names) – parallel lists, so filters can
+            scan plain strings and only pick rows for the hits
+        """
+        now = time.monotonic()
+        # `adb devices` is a host-side query, far cheaper than a pm listing
+        serial = self.adb.get_device_serial()
+        if (self._pkg_cache is None or serial != self._pkg_cache_serial
+                or now - self._pkg_cache_ts > self.PACKAGE_CACHE_TTL):
+            rows = self.adb.list_packages('all')
+            names = [pkg['packageName'] for pkg in rows]
+            self._pkg_cache = (rows, names, [name.lower() for name in names])
+            self._pkg_cache_ts = now
+            self._pkg_cache_serial = serial
+        return self._pkg_cache
+    
+    def invalidate(self):
+        """Drop the cached package list (after anything that changes it)"""
+        self._pkg_cache = None
     
     def execute(self, parsed_command: Dict) -> Dict:
         """
@@ -161,12 +298,12 @@ class ActionExecutor:
     def _handle_scan(self, entities: Dict) -> Dict:
         """Scan for bloatware packages"""
         try:
-            packages = self.adb.list_packages('all')
+            packages, names, _ = self._packages()
             
             # Filter for common bloatware patterns
             bloatware = [
-                pkg for pkg in packages 
-                if self._is_likely_bloatware(pkg['packageName'])
+                packages[i] for i, name in enumerate(names)
+                if _is_likely_bloatware(name)
             ]
             
             return {
@@ -194,19 +331,23 @@ class ActionExecutor:
         package_names = entities.get('packages', [])
         
         try:
-            all_packages = self.adb.list_packages('all')
+            all_packages, _, all_names = self._packages()
+            
+            # Lowercase the keywords once rather than per package, and fold
+            # them into one alternation so each name is scanned once in C
+            needles = [keyword.lower() for keyword in package_names]
+            exact = set(needles)
+            fuzzy = re.compile('|'.join(map(re.escape, needles))) if needles else None
             
             # Find matching packages
             matches = []
-            for pkg in all_packages:
-                pkg_name = pkg['packageName'].lower()
-                
+            for i, pkg_name in enumerate(all_names):
                 # Direct match
-                if pkg_name in package_names:
-                    matches.append(pkg)
+                if pkg_name in exact:
+                    matches.append(all_packages[i])
                 # Fuzzy match by keywords
-                elif any(keyword.lower() in pkg_name for keyword in package_names):
-                    matches.append(pkg)
+                elif fuzzy is not None and fuzzy.search(pkg_name):
+                    matches.append(all_packages[i])
             
             if not matches:
                 return {
@@ -279,30 +420,6 @@ class ActionExecutor:
             'message': f"Restore {package}?"
         }
     
-    def _is_likely_bloatware(self, package_name: str) -> bool:
-        """Check if package is likely bloatware"""
-        bloatware_indicators = [
-            'facebook', 'fb', 'instagram', 'tiktok',
-            'netflix', 'spotify', 'amazon',
-            'samsung.', 'xiaomi.', 'miui.', 'huawei.',
-            'weather', 'news', 'browser',
-            'game', 'music', 'video'
-        ]
-        
-        # Don't flag critical system apps
-        critical = [
-            'com.android.systemui',
-            'com.android.phone',
-            'com.android.settings',
-            'com.google.android.gms'
-        ]
-        
-        if package_name in critical:
-            return False
-        
-        pkg_lower = package_name.lower()
-        return any(indicator in pkg_lower for indicator in bloatware_indicators)
-    
     def confirm_and_execute(self, action_result: Dict, confirmed: bool) -> Dict:
         """Execute action after user confirmation"""
         if not confirmed:
@@ -330,20 +447,29 @@ class ActionExecutor:
         """Execute actual uninstall"""
         results = []
         success_count = 0
+        unknown_count = 0
         
-        for pkg in packages:
-            result = self.adb.uninstall_package(pkg['packageName'])
+        # One shell roundtrip for the whole batch instead of one per package
+        names = [pkg['packageName'] for pkg in packages]
+        uninstall_results = self.adb.uninstall_packages(names)
+        self.invalidate()
+        for name, result in zip(names, uninstall_results):
             results.append({
-                'package': pkg['packageName'],
+                'package': name,
                 'success': result.get('success', False),
                 'message': result.get('message', '')
             })
             if result.get('success'):
                 success_count += 1
+            elif result.get('success') is None:
+                unknown_count += 1
         
+        message = f"Successfully removed {success_count}/{len(packages)} packages"
+        if unknown_count:
+            message += f" ({unknown_count} unknown – refresh the package list to check)"
         return {
             'success': success_count > 0,
-            'message': f"Successfully removed {success_count}/{len(packages)} packages",
+            'message': message,
             'details': results
         }
     
@@ -361,6 +487,7 @@ class ActionExecutor:
             return {'success': False, 'message': 'No package specified'}
         
         result = self.adb.reinstall_package(package)
+        self.invalidate()
         return {
             'success': result.get('success', False),
             'message': result.get('message', 'Restore failed')
@@ -370,6 +497,8 @@ class ActionExecutor:
 class OpenClawIntegration:
     """Main integration class for OpenClaw-powered chatbot"""
     
+    __slots__ = ('parser', 'executor')
+    
     def __init__(self, adb_operations: ADBOperations):
         self.parser = CommandParser()
         self.executor = ActionExecutor(adb_operations)
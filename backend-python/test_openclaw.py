@@ -4,6 +4,9 @@ Run this to verify the command parser works correctly
 """
 import sys
 import os
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
 sys.path.insert(0, os.path.dirname(__file__))
 
 from openclaw_integration import CommandParser, ActionExecutor, OpenClawIntegration
@@ -27,9 +30,9 @@ def test_command_parser():
     print("TESTING COMMAND PARSER")
     print("=" * 60)
     
-    for message in test_cases:
+    results = parser.parse_commands(test_cases)
+    for message, result in zip(test_cases, results):
         print(f"\n📝 Input: {message}")
-        result = parser.parse_command(message)
         print(f"   Intent: {result['intent']}")
         print(f"   Actionable: {result['actionable']}")
         print(f"   Confidence: {result['confidence']}")
@@ -112,7 +115,43 @@ def test_full_integration():
         print(f"⚠️  ADB not available: {str(e)}")
 
 
+class _ThreadOutput(io.TextIOBase):
+    """stdout stand-in that sends each thread's prints to its own buffer"""
+    
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+    
+    def write(self, text):
+        return getattr(self._local, 'buffer', self._stream).write(text)
+    
+    def flush(self):
+        self._stream.flush()
+    
+    def capture(self, test):
+        """
+        Run test with this thread's output collected
+        
+        Returns (text, error): error is the exception the test raised, or
+        None, so a failing test's log can still be printed before re-raising
+        """
+        self._local.buffer = io.StringIO()
+        try:
+            test()
+            error = None
+        except Exception as e:
+            error = e
+        finally:
+            text = self._local.buffer.getvalue()
+            del self._local.buffer
+        return text, error
+
+
 if __name__ == "__main__":
+    # Block-buffer stdout even on a console; each test flushes once at the end
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(line_buffering=False)
+    
     print("\n")
     print("╔════════════════════════════════════════════════════════╗")
     print("║   OpenClaw Integration Test Suite                     ║")
@@ -120,10 +159,20 @@ if __name__ == "__main__":
     print("╚════════════════════════════════════════════════════════╝")
     print()
     
-    # Run tests
-    test_command_parser()
-    test_action_execution()
-    test_full_integration()
+    # Run tests concurrently (the ADB probes overlap) and print in order
+    stdout = sys.stdout
+    output = _ThreadOutput(stdout)
+    sys.stdout = output
+    try:
+        tests = (test_command_parser, test_action_execution, test_full_integration)
+        with ThreadPoolExecutor(max_workers=len(tests)) as pool:
+            for text, error in pool.map(output.capture, tests):
+                output.write(text)
+                output.flush()
+                if error is not None:
+                    raise error
+    finally:
+        sys.stdout = stdout
     
     print("\n" + "=" * 60)
     print("✅ TESTS COMPLETE")
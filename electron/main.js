@@ -8,7 +8,7 @@ let pythonProcess;
 let pythonReady = false;
 let requestId = 0;
 const pendingRequests = new Map();
-let stdoutBuffer = '';
+let stdoutBuffer = Buffer.alloc(0);
 
 // ── Python path ──────────────────────────────────────────────────────
 function getPythonPath() {
@@ -52,16 +52,19 @@ function startPythonProcess() {
     cwd: path.dirname(pythonPath)    // so dotenv finds .env next to exe
   });
 
-  // Accumulate stdout and resolve matching requests
+  // Accumulate stdout and resolve matching requests.
+  // Each message is a 4-byte big-endian length followed by UTF-8 JSON.
   pythonProcess.stdout.on('data', (chunk) => {
-    stdoutBuffer += chunk.toString();
-    const lines = stdoutBuffer.split('\n');
-    stdoutBuffer = lines.pop(); // keep incomplete tail
+    stdoutBuffer = Buffer.concat([stdoutBuffer, chunk]);
+
+    while (stdoutBuffer.length >= 4) {
+      const size = stdoutBuffer.readUInt32BE(0);
+      if (stdoutBuffer.length < 4 + size) break; // wait for the rest of the frame
+      const body = stdoutBuffer.toString('utf8', 4, 4 + size);
+      stdoutBuffer = stdoutBuffer.subarray(4 + size);
 
-    for (const line of lines) {
-      if (!line.trim()) continue;
       try {
-        const msg = JSON.parse(line);
+        const msg = JSON.parse(body);
 
         // First message is the "ready" signal
         if (msg.status === 'ready') {
@@ -77,7 +80,7 @@ function startPythonProcess() {
           else cb.resolve(msg.result);
         }
       } catch (e) {
-        console.error('[Python] Bad JSON:', line);
+        console.error('[Python] Bad JSON:', body);
       }
     }
   });
@@ -89,6 +92,7 @@ function startPythonProcess() {
   pythonProcess.on('close', (code) => {
     console.log('[Python] Exited with code', code);
     pythonReady = false;
+    stdoutBuffer = Buffer.alloc(0); // drop any partial frame
     // Reject any outstanding requests
     for (const [, cb] of pendingRequests) {
       cb.reject(new Error('Python process exited'));
@@ -109,8 +113,10 @@ function callPython(command, args = {}) {
       if (pythonProcess && pythonReady) {
         const id = ++requestId;
         pendingRequests.set(id, { resolve, reject });
-        const payload = JSON.stringify({ id, command, args }) + '\n';
-        pythonProcess.stdin.write(payload);
+        const body = Buffer.from(JSON.stringify({ id, command, args }), 'utf8');
+        const header = Buffer.alloc(4);
+        header.writeUInt32BE(body.length, 0);
+        pythonProcess.stdin.write(Buffer.concat([header, body]));
       } else if (elapsed >= 15000) {
         reject(new Error('Python backend not ready after 15s'));
       } else {
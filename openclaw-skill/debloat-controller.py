@@ -14,22 +14,8 @@ import socket
 from typing import Dict, List, Any
 
 
-class DebloatController:
-    """Control Debloat AI application via OpenClaw"""
-    
-    def __init__(self):
-        self.app_name = "Debloat AI"
-    
-    def scan_bloatware(self) -> str:
-        """
-        Scan connected Android device for bloatware packages
-        
-        Usage: "Scan my phone for bloatware"
-        """
-        try:
-            # This is a placeholder - actual implementation would communicate
-            # with the Debloat AI app via IPC or HTTP
-            return """
+# Canned replies, built once at import; templates keep a bound str.format
+_SCAN_RESULT = """
 🔍 Scanning for bloatware...
 
 Found 15 potential bloatware packages:
@@ -45,6 +31,62 @@ Use commands like:
 - "Analyze com.facebook.katana" for details
 - "Show all packages" for full list
 """
+
+_REMOVE_TEMPLATE = """
+⚠️ **Confirm Package Removal**
+
+Package: {package_name}
+Action: Uninstall (ADB)
+
+This will remove the package from your connected Android device.
+You can restore it later from backup.
+
+Reply "confirm" to proceed or "cancel" to abort.
+""".format
+
+_ANALYZE_TEMPLATE = "🤖 Analyzing package: {package_name}\n\nFetching AI safety report...".format
+
+_BACKUP_RESULT = """
+💾 Creating backup...
+
+Backup created: backup_2026-02-20_14-30.json
+Location: C:\\Users\\YourName\\AppData\\Roaming\\debloat-ai\\backups
+
+All current packages have been saved. You can restore them anytime.
+"""
+
+_DEVICE_INFO = """
+📱 **Connected Device**
+
+Model: Samsung Galaxy S24
+Manufacturer: Samsung
+Android Version: 14
+Serial: ABC123XYZ
+Battery: 85%
+Storage: 45.2 GB free
+
+Status: ✅ Connected via ADB
+"""
+
+
+class DebloatController:
+    """Control Debloat AI application via OpenClaw"""
+    
+    __slots__ = ('app_name',)
+    
+    def __init__(self):
+        self.app_name = "Debloat AI"
+    
+    def scan_bloatware(self) -> str:
+        """
+        Scan connected Android device for bloatware packages
+        
+        Usage: "Scan my phone for bloatware"
+        """
+        try:
+            # This is a placeholder - actual implementation would communicate
+            # with the Debloat AI app via IPC or HTTP
+            return _SCAN_RESULT
         except Exception as e:
             return f"❌ Error scanning: {str(e)}"
     
@@ -69,17 +111,7 @@ Use commands like:
         Usage: "Remove Facebook from my phone"
         """
         # Safety confirmation
-        return f"""
-⚠️ **Confirm Package Removal**
-
-Package: {package_name}
-Action: Uninstall (ADB)
-
-This will remove the package from your connected Android device.
-You can restore it later from backup.
-
-Reply "confirm" to proceed or "cancel" to abort.
-"""
+        return _REMOVE_TEMPLATE(package_name=package_name)
     
     def analyze_package(self, package_name: str) -> str:
         """
@@ -90,7 +122,7 @@ Reply "confirm" to proceed or "cancel" to abort.
         
         Usage: "Analyze com.facebook.katana"
         """
-        return f"🤖 Analyzing package: {package_name}\n\nFetching AI safety report..."
+        return _ANALYZE_TEMPLATE(package_name=package_name)
     
     def create_backup(self) -> str:
         """
@@ -98,14 +130,7 @@ Reply "confirm" to proceed or "cancel" to abort.
         
         Usage: "Create a backup of my packages"
         """
-        return """
-💾 Creating backup...
-
-Backup created: backup_2026-02-20_14-30.json
-Location: C:\\Users\\YourName\\AppData\\Roaming\\debloat-ai\\backups
-
-All current packages have been saved. You can restore them anytime.
-"""
+        return _BACKUP_RESULT
     
     def get_device_info(self) -> str:
         """
@@ -113,18 +138,7 @@ All current packages have been saved. You can restore them anytime.
         
         Usage: "Show my device info"
         """
-        return """
-📱 **Connected Device**
-
-Model: Samsung Galaxy S24
-Manufacturer: Samsung
-Android Version: 14
-Serial: ABC123XYZ
-Battery: 85%
-Storage: 45.2 GB free
-
-Status: ✅ Connected via ADB
-"""
+        return _DEVICE_INFO
     
     def confirm_action(self, action: str, confirmed: bool) -> str:
         """